@@ -1,24 +1,51 @@
 import argparse
 import ctypes
+from ctypes import wintypes
+import functools
 import time
 import re
 import signal
 import os
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List, Tuple, Dict, Any
+from typing import Optional, List, Tuple, Dict, Any, Iterator, NamedTuple
 
 import yaml
 
 __version__ = "0.0.1"
 
 # UI Automation
-from pywinauto import Desktop
+from pywinauto.controls.uiawrapper import UIAWrapper
+from pywinauto.uia_defines import IUIA
+from pywinauto.uia_element_info import UIAElementInfo
 
 # Input helpers
 import pyautogui
 
 
+EVENT_SYSTEM_FOREGROUND = 0x0003
+WINEVENT_OUTOFCONTEXT = 0x0000
+
+_WS_RE = re.compile(r"\s+")
+# Trailing keyboard hints: "(Ctrl+R)", " Alt+Enter", or a glued "Alt+⏎".
+_MODIFIER_TAIL_RE = re.compile(
+    r"\s*(?:\((?:alt|ctrl|shift|cmd|win)\+[^)]*\)"
+    r"|\s(?:alt|ctrl|shift|cmd|win)\+.*"
+    r"|(?:alt|ctrl|shift|cmd|win)\+.*)\s*$",
+    re.IGNORECASE,
+)
+# Constructs whose meaning changes when a pattern becomes one branch of a larger
+# regex: backrefs, named refs, conditionals and inline flag groups.
+_UNCOMBINABLE_REGEX_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(|\(\?[aiLmsux-]+[:)]")
+
+# Top-level UIA window wrappers keyed by hwnd, reused across polling iterations.
+_WINDOW_CACHE: Dict[int, Any] = {}
+
+# Lazily built (condition, cache_request) pair for batched control snapshots.
+_UIA_CONTROL_QUERY: Optional[Tuple[Any, Any]] = None
+
+
 def set_dpi_awareness():
     """
     Avoid wrong coordinates on Windows with scaling (125%/150%).
@@ -34,6 +61,10 @@ def set_dpi_awareness():
 
 @dataclass
 class Region:
+    # Explicit __slots__ (dataclass(slots=True) needs Python 3.10+): no per-instance
+    # __dict__ for the rects built per window on every poll.
+    __slots__ = ("left", "top", "width", "height")
+
     left: int
     top: int
     width: int
@@ -51,7 +82,11 @@ class Region:
         # rect: (l, t, r, b)
         l, t, r, b = rect
         # check intersection (not strict containment) so it still works if slightly over region edge
-        return not (r < self.left or l > self.right or b < self.top or t > self.bottom)
+        left = self.left
+        top = self.top
+        return (
+            r >= left and l <= left + self.width and b >= top and t <= top + self.height
+        )
 
     def intersect(self, other: "Region") -> Optional["Region"]:
         left = max(self.left, other.left)
@@ -65,10 +100,15 @@ class Region:
     def intersection_rect(
         self, rect: Tuple[int, int, int, int]
     ) -> Optional[Tuple[int, int, int, int]]:
-        left = max(self.left, rect[0])
-        top = max(self.top, rect[1])
-        right = min(self.right, rect[2])
-        bottom = min(self.bottom, rect[3])
+        # Per-control hot path: read fields directly instead of the
+        # right/bottom properties, and return a plain tuple (no Region).
+        l, t, r, b = rect
+        self_left = self.left
+        self_top = self.top
+        left = max(self_left, l)
+        top = max(self_top, t)
+        right = min(self_left + self.width, r)
+        bottom = min(self_top + self.height, b)
         if right <= left or bottom <= top:
             return None
         return (left, top, right, bottom)
@@ -79,8 +119,10 @@ def load_yaml(path: Path) -> dict:
         return yaml.safe_load(f)
 
 
+# UI labels are near-constant across polls, so the normalizers are memoized.
+@functools.lru_cache(maxsize=8192)
 def normalize_text(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip().lower())
+    return _WS_RE.sub(" ", (s or "").strip().lower())
 
 
 def normalize_control_label(s: str) -> str:
@@ -91,14 +133,18 @@ def normalize_control_label(s: str) -> str:
       "Run (Ctrl+R)" -> "run"
       "Accept all" -> "accept all"
     """
-    name = normalize_text(s)
-    name = re.sub(
-        r"\s*\((?:alt|ctrl|shift|cmd|win)\+[^)]*\)\s*$", "", name, flags=re.IGNORECASE
-    )
-    name = re.sub(r"\s+(?:alt|ctrl|shift|cmd|win)\+.*$", "", name, flags=re.IGNORECASE)
-    name = re.sub(r"(?:alt|ctrl|shift|cmd|win)\+.*$", "", name, flags=re.IGNORECASE)
-    name = re.sub(r"\s+", " ", name).strip()
-    return name
+    return label_from_normalized(normalize_text(s))
+
+
+@functools.lru_cache(maxsize=4096)
+def label_from_normalized(name: str) -> str:
+    """
+    normalize_control_label() for text already passed through normalize_text().
+    Every keyboard hint contains '+', so labels without one are returned as-is.
+    """
+    if "+" not in name:
+        return name
+    return _WS_RE.sub(" ", _MODIFIER_TAIL_RE.sub("", name)).strip()
 
 
 def is_exact_target_match(control_name: str, target: str) -> bool:
@@ -131,6 +177,38 @@ def compile_target_regexes(
     return compiled
 
 
+def combine_target_regexes(
+    target_patterns: List[Optional[re.Pattern]],
+) -> Optional[Tuple[re.Pattern, Dict[str, int]]]:
+    """
+    Fold per-target regexes into one alternation of "(?=.*?(?:pat))(?P<name>)"
+    branches: match() then behaves like search() per pattern, and the first
+    branch that matches is the highest-priority target.
+    Returns None if there is nothing to combine or it can't be done safely:
+    group references (numbered backrefs, (?P=name), (?(group)...) conditionals)
+    would point at the wrong group once patterns are joined, and inline flags
+    would leak into the other branches (Python < 3.11 only warns about a
+    mid-pattern "(?x)" and applies it to the whole alternation).
+    """
+    branches = []
+    group_targets: Dict[str, int] = {}
+    for idx, pattern in enumerate(target_patterns):
+        if pattern is None:
+            continue
+        if _UNCOMBINABLE_REGEX_RE.search(pattern.pattern):
+            return None
+        group = f"_dw_t{idx}"
+        branches.append(f"(?=.*?(?:{pattern.pattern}))(?P<{group}>)")
+        group_targets[group] = idx
+    if len(branches) < 2:
+        return None
+    try:
+        combined = re.compile("|".join(branches), re.IGNORECASE)
+    except re.error:
+        return None
+    return combined, group_targets
+
+
 def format_targets_for_log(targets: List[str]) -> str:
     normalized = [str(t).strip() for t in targets if str(t).strip()]
     if not normalized:
@@ -186,14 +264,38 @@ def get_virtual_screen_region() -> Region:
     """
     Return the virtual desktop bounds across monitors.
     """
+    return _virtual_screen_cached()
+
+
+@functools.lru_cache(maxsize=1)
+def _virtual_screen_cached() -> Region:
+    # Bounds only change on monitor reconfiguration; call
+    # _virtual_screen_cached.cache_clear() to force a fresh probe.
     try:
-        user32 = ctypes.windll.user32
-        left = int(user32.GetSystemMetrics(76))  # SM_XVIRTUALSCREEN
-        top = int(user32.GetSystemMetrics(77))  # SM_YVIRTUALSCREEN
-        width = int(user32.GetSystemMetrics(78))  # SM_CXVIRTUALSCREEN
-        height = int(user32.GetSystemMetrics(79))  # SM_CYVIRTUALSCREEN
-        if width > 0 and height > 0:
-            return Region(left=left, top=top, width=width, height=height)
+        # One EnumDisplayMonitors call; the virtual desktop is the union of all
+        # monitor rects (same bounds as SM_[XY]VIRTUALSCREEN / SM_C[XY]VIRTUALSCREEN).
+        monitor_rects: List[Tuple[int, int, int, int]] = []
+
+        @ctypes.WINFUNCTYPE(
+            wintypes.BOOL,
+            wintypes.HMONITOR,
+            wintypes.HDC,
+            ctypes.POINTER(wintypes.RECT),
+            wintypes.LPARAM,
+        )
+        def _collect(_monitor, _hdc, rect_ptr, _lparam):
+            r = rect_ptr.contents
+            monitor_rects.append((r.left, r.top, r.right, r.bottom))
+            return True
+
+        ctypes.windll.user32.EnumDisplayMonitors(None, None, _collect, 0)
+        if monitor_rects:
+            left = min(r[0] for r in monitor_rects)
+            top = min(r[1] for r in monitor_rects)
+            width = max(r[2] for r in monitor_rects) - left
+            height = max(r[3] for r in monitor_rects) - top
+            if width > 0 and height > 0:
+                return Region(left=left, top=top, width=width, height=height)
     except Exception:
         pass
 
@@ -375,40 +477,142 @@ def ensure_window_ready(window: Any, verbose: bool = False) -> Optional[Region]:
     )
 
 
-def get_matching_windows(
-    window_title_regex: str, verbose: bool = False
-) -> List[Tuple[Any, Region]]:
+def enum_visible_windows() -> List[Tuple[int, str]]:
     """
-    Find windows that match the title regex and return them with usable bounds.
+    List (hwnd, title) for visible top-level windows using plain Win32 calls (no COM).
     """
-    title_re = re.compile(window_title_regex, re.IGNORECASE)
+    user32 = ctypes.windll.user32
+    title_buf = ctypes.create_unicode_buffer(512)
+    found: List[Tuple[int, str]] = []
+
+    @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    def _collect(hwnd, _lparam):
+        if hwnd and user32.IsWindowVisible(hwnd) and user32.GetWindowTextLengthW(hwnd):
+            user32.GetWindowTextW(hwnd, title_buf, len(title_buf))
+            found.append((int(hwnd), title_buf.value))
+        return True
 
-    try:
-        desktop = Desktop(backend="uia")
-        windows = desktop.windows()
-    except Exception as e:
-        if verbose:
-            print(f"[UIA] Desktop init failed: {e}")
-        return []
+    user32.EnumWindows(_collect, 0)
+    return found
 
-    matches: List[Tuple[Any, Region]] = []
-    for window in windows:
-        try:
-            title = window.window_text() or ""
-        except Exception:
-            continue
 
+def get_window_region(hwnd: int) -> Optional[Region]:
+    """
+    Window bounds via GetWindowRect, or None if the window has no usable area.
+    """
+    rect = wintypes.RECT()
+    if not ctypes.windll.user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+        return None
+    width = rect.right - rect.left
+    height = rect.bottom - rect.top
+    if width <= 1 or height <= 1:
+        return None
+    return Region(left=rect.left, top=rect.top, width=width, height=height)
+
+
+def get_cached_window(hwnd: int) -> Any:
+    """
+    Return the UIA wrapper for a top-level hwnd, reusing it across polls.
+    """
+    window = _WINDOW_CACHE.get(hwnd)
+    if window is None:
+        window = UIAWrapper(UIAElementInfo(hwnd))
+        _WINDOW_CACHE[hwnd] = window
+    return window
+
+
+def get_foreground_window() -> Optional[Tuple[int, str]]:
+    """
+    Return (hwnd, title) of the foreground window using plain Win32 calls.
+    """
+    user32 = ctypes.windll.user32
+    hwnd = user32.GetForegroundWindow()
+    if not hwnd:
+        return None
+    length = user32.GetWindowTextLengthW(hwnd)
+    if length <= 0:
+        return None
+    title_buf = ctypes.create_unicode_buffer(length + 1)
+    user32.GetWindowTextW(hwnd, title_buf, length + 1)
+    return int(hwnd), title_buf.value
+
+
+def get_ready_windows(
+    hwnds_with_titles: List[Tuple[int, str]],
+    title_re: re.Pattern,
+    verbose: bool = False,
+) -> List[Tuple[Any, Region]]:
+    """
+    Wrap the hwnds whose title matches and return them with usable bounds.
+    """
+    user32 = ctypes.windll.user32
+    matches: List[Tuple[Any, Region]] = []
+    for hwnd, title in hwnds_with_titles:
         if not title_re.search(title):
             continue
 
-        region = ensure_window_ready(window, verbose=verbose)
-        if region is None:
+        try:
+            window = get_cached_window(hwnd)
+        except Exception:
             continue
+
+        if user32.IsIconic(hwnd):
+            # Minimized: go through UIA so the window gets restored.
+            region = ensure_window_ready(window, verbose=verbose)
+            if region is None:
+                # A stale wrapper (e.g. recycled hwnd) is rebuilt on the next poll.
+                _WINDOW_CACHE.pop(hwnd, None)
+                continue
+        else:
+            region = get_window_region(hwnd)
+            if region is None:
+                continue
         matches.append((window, region))
 
     return matches
 
 
+def get_matching_windows(
+    title_re: re.Pattern,
+    verbose: bool = False,
+    prefer_foreground: bool = False,
+) -> List[Tuple[Any, Region]]:
+    """
+    Find windows that match the compiled title regex and return them with usable bounds.
+    With prefer_foreground, a matching foreground window is returned on its own
+    and the full window enumeration only runs when it doesn't match.
+    """
+    if prefer_foreground:
+        try:
+            foreground = get_foreground_window()
+        except Exception:
+            foreground = None
+        if foreground is not None:
+            matches = get_ready_windows([foreground], title_re, verbose=verbose)
+            if matches:
+                # No enumeration this poll, so validate cached hwnds directly.
+                user32 = ctypes.windll.user32
+                for hwnd in list(_WINDOW_CACHE):
+                    if not user32.IsWindow(hwnd):
+                        del _WINDOW_CACHE[hwnd]
+                return matches
+
+    try:
+        visible_windows = enum_visible_windows()
+    except Exception as e:
+        if verbose:
+            print(f"[UIA] Window enumeration failed: {e}")
+        return []
+
+    # Drop wrappers for windows that have closed since the last poll.
+    live_hwnds = {hwnd for hwnd, _ in visible_windows}
+    for hwnd in list(_WINDOW_CACHE):
+        if hwnd not in live_hwnds:
+            del _WINDOW_CACHE[hwnd]
+
+    return get_ready_windows(visible_windows, title_re, verbose=verbose)
+
+
 def apply_scope_to_windows(
     windows_with_regions: List[Tuple[Any, Region]],
     scope_region: Optional[Region],
@@ -441,6 +645,80 @@ def apply_scope_to_windows(
     return scoped
 
 
+def get_uia_control_query() -> Tuple[Any, Any]:
+    """
+    Build (once) the UIA condition and cache request used to snapshot controls.
+    The cache request prefetches every property the click loop reads.
+    """
+    global _UIA_CONTROL_QUERY
+    if _UIA_CONTROL_QUERY is None:
+        uia = IUIA()
+        # "Any named element" covers the preferred button-like types as well as
+        # the Electron/webview fallback, so one condition serves both passes.
+        condition = uia.iuia.CreateNotCondition(
+            uia.iuia.CreatePropertyCondition(uia.UIA_dll.UIA_NamePropertyId, "")
+        )
+        cache_request = uia.iuia.CreateCacheRequest()
+        cache_request.AddProperty(uia.UIA_dll.UIA_NamePropertyId)
+        cache_request.AddProperty(uia.UIA_dll.UIA_BoundingRectanglePropertyId)
+        cache_request.AddProperty(uia.UIA_dll.UIA_ControlTypePropertyId)
+        cache_request.AddProperty(uia.UIA_dll.UIA_IsInvokePatternAvailablePropertyId)
+        _UIA_CONTROL_QUERY = (condition, cache_request)
+    return _UIA_CONTROL_QUERY
+
+
+class UiaControl(NamedTuple):
+    name: str  # raw UIA Name
+    norm: str  # normalize_text(name)
+    control_type: str
+    rect: Tuple[int, int, int, int]  # (l, t, r, b)
+    can_invoke: bool
+    element: Any  # IUIAutomationElement
+
+
+def iter_uia_named_controls(window: Any) -> Iterator[UiaControl]:
+    """
+    Fetch every named descendant of a window with a single FindAllBuildCache call
+    and yield them one by one in document order. The FindAll runs immediately so
+    errors reach the caller; controls are built lazily from the UIA cache, so a
+    caller that stops early never touches the remaining elements.
+    """
+    uia = IUIA()
+    condition, cache_request = get_uia_control_query()
+    elements = window.element_info.element.FindAllBuildCache(
+        uia.tree_scope["descendants"], condition, cache_request
+    )
+    return _iter_cached_controls(uia, elements)
+
+
+def _iter_cached_controls(uia: Any, elements: Any) -> Iterator[UiaControl]:
+    for idx in range(elements.Length):
+        try:
+            element = elements.GetElement(idx)
+            name_raw = element.CachedName
+            if not name_raw:
+                continue
+            bounds = element.CachedBoundingRectangle
+            control_type = uia.known_control_type_ids.get(
+                element.CachedControlType, "Any"
+            )
+            can_invoke = bool(
+                element.GetCachedPropertyValue(
+                    uia.UIA_dll.UIA_IsInvokePatternAvailablePropertyId
+                )
+            )
+        except Exception:
+            continue
+        yield UiaControl(
+            name=name_raw,
+            norm=normalize_text(name_raw),
+            control_type=control_type,
+            rect=(bounds.left, bounds.top, bounds.right, bounds.bottom),
+            can_invoke=can_invoke,
+            element=element,
+        )
+
+
 def uia_click_targets(
     windows_with_regions: List[Tuple[Any, Region]],
     targets: List[str],
@@ -464,155 +742,272 @@ def uia_click_targets(
     # Common UIA control types seen across desktop/webview/Electron button-like widgets.
     preferred_control_types = ["Button", "Hyperlink", "MenuItem", "SplitButton"]
 
-    # Global priority order: process first target across all windows before second target.
-    for target_index, target in enumerate(targets_n):
-        target_pattern = target_patterns[target_index]
-        for window, window_region in windows_with_regions:
-            for control_type in preferred_control_types:
-                try:
-                    controls = window.descendants(control_type=control_type)
-                except Exception:
-                    continue
+    def print_debug_candidate(
+        title: str,
+        name_raw: str,
+        candidate_norm: str,
+        control_type: str,
+        in_scope: bool,
+        rect: Tuple[int, int, int, int],
+    ) -> None:
+        debug_key = (title or "", candidate_norm, rect)
+        if debug_key in seen_debug_candidates or not any(
+            term in candidate_norm for term in debug_terms
+        ):
+            return
+        checks = []
+        for idx, t in enumerate(targets_n):
+            tp = target_patterns[idx]
+            if tp is None:
+                matched = is_exact_target_match(name_raw, t)
+                mode = "exact"
+            else:
+                matched = tp.search(candidate_norm) is not None
+                mode = f"regex:{tp.pattern}"
+            checks.append(f"{t}={matched}({mode})")
+        print(
+            "[DEBUG][UIA] "
+            f"text='{name_raw}' label='{normalize_control_label(name_raw)}' "
+            f"type={control_type} in_scope={in_scope} rect={rect} "
+            f"checks=[{', '.join(checks)}]"
+        )
+        seen_debug_candidates.add(debug_key)
+
+    # Exact targets resolve with one dict lookup per control; regex targets are
+    # searched in priority order only until a better (lower) index is known.
+    exact_target_index: Dict[str, int] = {}
+    regex_targets: List[Tuple[int, re.Pattern]] = []
+    for idx, t in enumerate(targets_n):
+        if target_patterns[idx] is None:
+            exact_target_index.setdefault(t, idx)
+        else:
+            regex_targets.append((idx, target_patterns[idx]))
+
+    # A control can only equal an exact target if its text contains the target's
+    # first word, so one substring scan rejects most controls up front. Regex
+    # targets can match arbitrary text, and debug output wants near matches, so
+    # the prefilter is only used for all-exact targets outside debug mode.
+    target_needles: Optional[Tuple[str, ...]] = None
+    if not regex_targets and not debug_mode:
+        target_needles = tuple({t.split(" ", 1)[0] for t in targets_n})
+
+    combined_regex = combine_target_regexes(target_patterns)
+
+    def match_target_index(candidate_norm: str) -> Optional[int]:
+        best = exact_target_index.get(label_from_normalized(candidate_norm))
+        if combined_regex is not None:
+            m = combined_regex[0].match(candidate_norm)
+            if m is None:
+                return best
+            regex_best = combined_regex[1][m.lastgroup]
+            return regex_best if best is None or regex_best < best else best
+        for idx, pattern in regex_targets:
+            if best is not None and idx > best:
+                break
+            if pattern.search(candidate_norm) is not None:
+                return idx
+        return best
+
+    def click_preferred(window_region: Region, title: str, c: UiaControl) -> bool:
+        if verbose:
+            print(
+                f"[UIA] Clicking '{c.name}' "
+                f"(type={c.control_type}) at {c.rect} (window='{title}')"
+            )
 
-                for control in controls:
-                    try:
-                        title = window.window_text()
-                        name_raw = control.window_text()
-                        if not name_raw:
-                            continue
-
-                        candidate_norm = normalize_text(name_raw)
-                        candidate_label = normalize_control_label(name_raw)
-                        r = control.rectangle()
-                        rect = (r.left, r.top, r.right, r.bottom)
-                        in_scope = window_region.contains_rect(rect)
-
-                        if debug_mode:
-                            debug_key = (title or "", candidate_norm, rect)
-                            if debug_key not in seen_debug_candidates and any(
-                                term in candidate_norm for term in debug_terms
-                            ):
-                                checks = []
-                                for idx, t in enumerate(targets_n):
-                                    tp = target_patterns[idx]
-                                    if tp is None:
-                                        matched = is_exact_target_match(name_raw, t)
-                                        mode = "exact"
-                                    else:
-                                        matched = tp.search(candidate_norm) is not None
-                                        mode = f"regex:{tp.pattern}"
-                                    checks.append(f"{t}={matched}({mode})")
-                                print(
-                                    "[DEBUG][UIA] "
-                                    f"text='{name_raw}' label='{candidate_label}' "
-                                    f"type={control_type} in_scope={in_scope} rect={rect} "
-                                    f"checks=[{', '.join(checks)}]"
-                                )
-                                seen_debug_candidates.add(debug_key)
-
-                        if target_pattern is not None:
-                            if target_pattern.search(candidate_norm) is None:
-                                continue
-                        elif not is_exact_target_match(name_raw, target):
-                            continue
-
-                        if not in_scope:
-                            continue
-
-                        if verbose:
-                            print(
-                                f"[UIA] Clicking '{control.window_text()}' "
-                                f"(type={control_type}) at {rect} (window='{title}')"
-                            )
-
-                        try:
-                            control.invoke()
-                        except Exception:
-                            try:
-                                control.click_input()
-                            except Exception:
-                                clipped_rect = window_region.intersection_rect(rect)
-                                if clipped_rect is None:
-                                    continue
-                                click_x = (clipped_rect[0] + clipped_rect[2]) // 2
-                                click_y = (clipped_rect[1] + clipped_rect[3]) // 2
-                                pyautogui.click(click_x, click_y)
-                        return True
-                    except Exception:
-                        continue
+        # Only the matched control gets a live wrapper.
+        control = UIAWrapper(UIAElementInfo(c.element))
+        try:
+            if not c.can_invoke:
+                raise RuntimeError("Invoke pattern not available")
+            control.invoke()
+        except Exception:
+            try:
+                control.click_input()
+            except Exception:
+                clipped_rect = window_region.intersection_rect(c.rect)
+                if clipped_rect is None:
+                    return False
+                click_x = (clipped_rect[0] + clipped_rect[2]) // 2
+                click_y = (clipped_rect[1] + clipped_rect[3]) // 2
+                pyautogui.click(click_x, click_y)
+        return True
+
+    def click_fallback(window_region: Region, title: str, c: UiaControl) -> bool:
+        clipped_rect = window_region.intersection_rect(c.rect)
+        if clipped_rect is None:
+            return False
+        click_x = (clipped_rect[0] + clipped_rect[2]) // 2
+        click_y = (clipped_rect[1] + clipped_rect[3]) // 2
+        if verbose:
+            print(
+                f"[UIA] Fallback click on '{c.name}' "
+                f"at ({click_x},{click_y}) (window='{title}')"
+            )
+        pyautogui.click(click_x, click_y)
+        return True
 
-            # Final fallback: search any named element with exact target text and click its center.
-            # This catches Electron/webview controls that don't expose standard button control types.
+    def try_click(entry) -> bool:
+        key, window_region, title, c = entry
+        try:
+            if key[2] == 0:
+                return click_preferred(window_region, title, c)
+            return click_fallback(window_region, title, c)
+        except Exception:
+            return False
+
+    # Window-first scan: each window is streamed once and every control is
+    # tested against all targets. Matches are ranked so the original global
+    # priority holds: first target across all windows before the second, and
+    # within a window the preferred control types (tier 0, in preference order)
+    # before the any-element fallback (tier 1, in document order).
+    # A match may still fail to click (no Invoke, zero-area or edge-only rect),
+    # so scanning only stops early after a click has actually succeeded.
+    candidates = []
+    for window_index, (window, window_region) in enumerate(windows_with_regions):
+        try:
+            title = window.window_text()
+            controls = iter_uia_named_controls(window)
+        except Exception:
+            continue
+
+        for position, c in enumerate(controls):
+            if target_needles is not None and not any(
+                needle in c.norm for needle in target_needles
+            ):
+                continue
             try:
-                all_controls = window.descendants()
+                preferred = c.control_type in preferred_control_types
+                in_scope = window_region.contains_rect(c.rect)
+                l, t, r, b = c.rect
+                # The center-click fallback needs a real area to aim at.
+                fallback_clickable = (r - l) > 1 and (b - t) > 1
+                if not debug_mode and not (
+                    in_scope and (preferred or fallback_clickable)
+                ):
+                    # Can never be clicked, so skip label/regex matching entirely.
+                    continue
+                if debug_mode and preferred:
+                    print_debug_candidate(
+                        title, c.name, c.norm, c.control_type, in_scope, c.rect
+                    )
+
+                target_index = match_target_index(c.norm)
+                if target_index is None:
+                    continue
+
+                if debug_mode and not preferred:
+                    print_debug_candidate(
+                        title, c.name, c.norm, "Any", in_scope, c.rect
+                    )
+
+                if not in_scope:
+                    continue
             except Exception:
                 continue
-            for control in all_controls:
-                try:
-                    title = window.window_text()
-                    name_raw = control.window_text()
-                    if not name_raw:
-                        continue
-
-                    candidate_norm = normalize_text(name_raw)
-                    candidate_label = normalize_control_label(name_raw)
-
-                    if target_pattern is not None:
-                        if target_pattern.search(candidate_norm) is None:
-                            continue
-                    elif not is_exact_target_match(name_raw, target):
-                        continue
-
-                    r = control.rectangle()
-                    rect = (r.left, r.top, r.right, r.bottom)
-                    in_scope = window_region.contains_rect(rect)
-                    if debug_mode:
-                        debug_key = (title or "", candidate_norm, rect)
-                        if debug_key not in seen_debug_candidates and any(
-                            term in candidate_norm for term in debug_terms
-                        ):
-                            checks = []
-                            for idx, t in enumerate(targets_n):
-                                tp = target_patterns[idx]
-                                if tp is None:
-                                    matched = is_exact_target_match(name_raw, t)
-                                    mode = "exact"
-                                else:
-                                    matched = tp.search(candidate_norm) is not None
-                                    mode = f"regex:{tp.pattern}"
-                                checks.append(f"{t}={matched}({mode})")
-                            print(
-                                "[DEBUG][UIA] "
-                                f"text='{name_raw}' label='{candidate_label}' "
-                                f"type=Any in_scope={in_scope} rect={rect} "
-                                f"checks=[{', '.join(checks)}]"
-                            )
-                            seen_debug_candidates.add(debug_key)
-
-                    if not in_scope:
-                        continue
-
-                    if (r.right - r.left) <= 1 or (r.bottom - r.top) <= 1:
-                        continue
-
-                    clipped_rect = window_region.intersection_rect(rect)
-                    if clipped_rect is None:
-                        continue
-                    click_x = (clipped_rect[0] + clipped_rect[2]) // 2
-                    click_y = (clipped_rect[1] + clipped_rect[3]) // 2
-                    if verbose:
-                        print(
-                            f"[UIA] Fallback click on '{control.window_text()}' "
-                            f"at ({click_x},{click_y}) (window='{title}')"
-                        )
-                    pyautogui.click(click_x, click_y)
+
+            if preferred:
+                rank = preferred_control_types.index(c.control_type)
+                entry = (
+                    (target_index, window_index, 0, rank, position),
+                    window_region,
+                    title,
+                    c,
+                )
+                if target_index == 0 and rank == 0:
+                    # First target on the first preferred type: nothing still
+                    # unscanned can outrank it, so try it now and skip the rest
+                    # of the tree on success. On failure keep streaming.
+                    if try_click(entry):
+                        return True
+                else:
+                    candidates.append(entry)
+            # Final fallback: click the center of any named element with the target
+            # text. This catches Electron/webview controls that don't expose
+            # standard button control types.
+            if fallback_clickable:
+                candidates.append(
+                    (
+                        (target_index, window_index, 1, 0, position),
+                        window_region,
+                        title,
+                        c,
+                    )
+                )
+
+        # Later windows can't outrank first-target matches already collected, so
+        # try those now; the ones that fail are dropped and the scan goes on.
+        first_target = [entry for entry in candidates if entry[0][0] == 0]
+        if first_target:
+            first_target.sort(key=lambda entry: entry[0])
+            for entry in first_target:
+                if try_click(entry):
                     return True
-                except Exception:
-                    continue
+            candidates = [entry for entry in candidates if entry[0][0] != 0]
+
+    candidates.sort(key=lambda entry: entry[0])
+    for entry in candidates:
+        if try_click(entry):
+            return True
 
     return False
 
 
+def next_poll_interval(interval_s: float, empty_streak: int) -> float:
+    """
+    Adaptive polling: double the interval for every 5 consecutive polls with no
+    matching window (up to 16x), capped at 30s (or interval_s if that is larger).
+    """
+    backoff = interval_s * (2 ** min(empty_streak // 5, 4))
+    return min(backoff, max(30.0, interval_s))
+
+
+def start_foreground_wake_hook(
+    wake_event: threading.Event, verbose: bool = False
+) -> threading.Thread:
+    """
+    Set wake_event whenever the foreground window changes, so a backed-off poll
+    loop reacts as soon as the user switches to a (possibly matching) window.
+    The WinEvent hook needs a message loop, so it lives on a daemon thread.
+    """
+
+    def _run() -> None:
+        user32 = ctypes.windll.user32
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        win_event_proc = ctypes.WINFUNCTYPE(
+            None,
+            wintypes.HANDLE,
+            wintypes.DWORD,
+            wintypes.HWND,
+            wintypes.LONG,
+            wintypes.LONG,
+            wintypes.DWORD,
+            wintypes.DWORD,
+        )
+        callback = win_event_proc(lambda *_args: wake_event.set())
+        hook = user32.SetWinEventHook(
+            EVENT_SYSTEM_FOREGROUND,
+            EVENT_SYSTEM_FOREGROUND,
+            None,
+            callback,
+            0,
+            0,
+            WINEVENT_OUTOFCONTEXT,
+        )
+        if not hook:
+            if verbose:
+                print("[POLL] Foreground hook unavailable; using timed polling only.")
+            return
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+    thread = threading.Thread(target=_run, name="foreground-wake-hook", daemon=True)
+    thread.start()
+    return thread
+
+
 def main() -> None:
     set_dpi_awareness()
 
@@ -638,6 +1033,7 @@ def main() -> None:
     debug_mode = bool(cfg.get("debug_mode", False))
     ignore_keyboard_interrupt = bool(cfg.get("ignore_keyboard_interrupt", True))
     continue_on_error = bool(cfg.get("continue_on_error", True))
+    adaptive_polling = bool(cfg.get("adaptive_polling", False))
 
     env_verbose = get_bool_env("DUMB_WAITER_VERBOSE")
     env_debug_mode = get_bool_env("DUMB_WAITER_DEBUG_MODE")
@@ -655,6 +1051,15 @@ def main() -> None:
         raise SystemExit(
             "Config 'uia.window_title_regex' is required and must be non-empty."
         )
+    try:
+        title_re = re.compile(window_title_regex, re.IGNORECASE)
+    except re.error as exc:
+        raise SystemExit(
+            f"Invalid uia.window_title_regex regex '{window_title_regex}': {exc}"
+        )
+    prefer_foreground_window = bool(
+        cfg.get("uia", {}).get("prefer_foreground_window", False)
+    )
     target_regexes = cfg.get("uia", {}).get("target_regexes", [])
     if target_regexes is not None and not isinstance(target_regexes, list):
         raise SystemExit("Config 'uia.target_regexes' must be a list when provided.")
@@ -715,15 +1120,24 @@ def main() -> None:
         print(f"  debug_mode = {debug_mode}")
         print(f"  ignore_keyboard_interrupt = {ignore_keyboard_interrupt}")
         print(f"  continue_on_error = {continue_on_error}")
+        print(f"  adaptive_polling = {adaptive_polling}")
         print(
             f"  uia.enabled = {uia_enabled}, window_title_regex = {window_title_regex}"
         )
+        print(f"  uia.prefer_foreground_window = {prefer_foreground_window}")
+
+    wake_event = threading.Event()
+    if adaptive_polling:
+        start_foreground_wake_hook(wake_event, verbose=verbose)
+    empty_streak = 0
 
     while True:
         try:
             clicked = False
             windows_with_regions = get_matching_windows(
-                window_title_regex, verbose=verbose
+                title_re,
+                verbose=verbose,
+                prefer_foreground=prefer_foreground_window,
             )
             scoped_windows = apply_scope_to_windows(
                 windows_with_regions,
@@ -756,7 +1170,17 @@ def main() -> None:
             if verbose and not clicked:
                 print("[IDLE] No target found.")
 
-            time.sleep(interval_s)
+            if adaptive_polling:
+                empty_streak = 0 if windows_with_regions else empty_streak + 1
+                sleep_s = next_poll_interval(interval_s, empty_streak)
+                if verbose and sleep_s > interval_s:
+                    print(f"[POLL] No matching windows; next poll in {sleep_s}s.")
+                if wake_event.wait(sleep_s):
+                    # Foreground window changed: poll now. The backoff only resets
+                    # if that poll (or a later one) finds a matching window.
+                    wake_event.clear()
+            else:
+                time.sleep(interval_s)
         except KeyboardInterrupt:
             if ignore_keyboard_interrupt:
                 if verbose:
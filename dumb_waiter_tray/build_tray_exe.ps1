@@ -17,6 +17,7 @@ Set-StrictMode -Version Latest
 $ErrorActionPreference = "Stop"
 
 $TrayScript = Join-Path $PSScriptRoot "tray_app.py"
+$IconsDir = Join-Path $PSScriptRoot "icons"
 $Requirements = Join-Path $PSScriptRoot "requirements.txt"
 $BuildDir = Join-Path $PSScriptRoot "build"
 $InstallTaskScript = Join-Path $PSScriptRoot "scripts\install_startup_task.ps1"
@@ -252,7 +253,8 @@ $PyArgs = @(
   "--name", $Name,
   "--distpath", $OutputDir,
   "--workpath", $BuildDir,
-  "--specpath", $PSScriptRoot
+  "--specpath", $PSScriptRoot,
+  "--add-data", "$IconsDir;icons"
 )
 
 if ($IconPath) {
@@ -0,0 +1,28 @@
+"""
+Re-render the tray status icons shipped in dumb_waiter_tray/icons.
+
+Run after changing make_status_icon():
+
+    python .\\dumb_waiter_tray\\scripts\\render_icons.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tray_app import ICON_DIR, ICON_FILES, make_status_icon  # noqa: E402
+
+
+def main() -> None:
+    ICON_DIR.mkdir(parents=True, exist_ok=True)
+    for active, name in ICON_FILES.items():
+        path = ICON_DIR / name
+        make_status_icon(active).save(path, format="PNG", optimize=True)
+        print(f"wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,11 @@ import sys
 import threading
 import time
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 import traceback
 
 import pystray
-from PIL import Image, ImageDraw
+from PIL import Image
 
 
 COLOR_IDLE = (34, 197, 94, 255)  # Green: idle / waiting
@@ -21,11 +21,24 @@ COLOR_ACTIVE = (220, 38, 38, 255)  # Red: active / clicker on
 COLOR_BG_RING = (15, 23, 42, 255)
 COLOR_FOREGROUND = (255, 255, 255, 255)
 
+TITLE_ACTIVE = "Dumb Waiter | ACTIVE"
+TITLE_IDLE = "Dumb Waiter | IDLE"
+
+# Resolved once at import; resolve() canonicalizes every path component on Windows.
+_MODULE_FILE = Path(__file__).resolve()
+_REPO_ROOT_DEFAULT = _MODULE_FILE.parents[1]
+
+# Pre-rendered by scripts/render_icons.py; bundled into the EXE by build_tray_exe.ps1.
+ICON_DIR = _MODULE_FILE.parent / "icons"
+ICON_FILES = {False: "idle.png", True: "active.png"}
+
 
 def make_status_icon(active: bool) -> Image.Image:
     """
     Draw a simple pointer-click inspired status icon.
     """
+    from PIL import ImageDraw
+
     fill = COLOR_ACTIVE if active else COLOR_IDLE
     img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
@@ -50,6 +63,17 @@ def make_status_icon(active: bool) -> Image.Image:
     return img
 
 
+def load_status_icon(active: bool) -> Image.Image:
+    """
+    Load the shipped status icon PNG, drawing it only if the file is missing.
+    """
+    try:
+        with Image.open(ICON_DIR / ICON_FILES[active]) as img:
+            return img.convert("RGBA")
+    except OSError:
+        return make_status_icon(active)
+
+
 class DumbWaiterTrayApp:
     def __init__(
         self,
@@ -57,40 +81,100 @@ class DumbWaiterTrayApp:
         python_path: Optional[Path] = None,
         debug: bool = False,
     ) -> None:
-        self.config_path = config_path.resolve()
+        self.config_path = (
+            config_path if config_path.is_absolute() else config_path.resolve()
+        )
         self.repo_root = self._resolve_repo_root(self.config_path)
         self.worker_script = self.repo_root / "dumb_waiter.py"
+        # _resolve_repo_root already proved the script exists when it picked the
+        # config folder; otherwise stat it once. Starts only re-check while missing.
+        self._worker_script_found = (
+            self.repo_root == self.config_path.parent or self.worker_script.exists()
+        )
         self.requested_python_path = python_path
         self.debug = debug
         self.log_path = self.repo_root / "dumb_waiter_tray" / "worker.log"
         self.tray_log_path = self.repo_root / "dumb_waiter_tray" / "tray.log"
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        # String forms for the start path (os.path/Popen) so it builds no Path objects.
+        self._worker_script_str = str(self.worker_script)
+        self._config_path_str = str(self.config_path)
+        self._cwd_str = str(self.repo_root)
+        self._python_executable: Optional[str] = None
+        self._cmd_template: Optional[List[str]] = None
 
         self._lock = threading.Lock()
+        # tray.log stays open (line-buffered) for the app lifetime once first used.
+        self._tray_log_lock = threading.Lock()
+        self._tray_log_fp = None
         self._stop_event = threading.Event()
+        # Menu clicks only record intent; _state_loop applies the latest one, so
+        # rapid toggles collapse and the tray UI thread never waits on the worker.
+        self._state_cv = threading.Condition()
+        self._desired_running = False
+        self._applied_running = False
+        self._reload_requested = False
+        # Set by _wait_worker when the worker exits on its own; see _state_loop.
+        self._worker_exited = False
         self._worker_process: Optional[subprocess.Popen] = None
         self._worker_log_handle = None
+        self._starting = False
         self._last_exit_code: Optional[int] = None
-
-        self.icon = pystray.Icon(
-            "DumbWaiterTray", make_status_icon(False), "Dumb Waiter | IDLE"
-        )
+        self._render_lock = threading.Lock()
+        # (running, last_exit_code) last shown in the tray; None forces a render.
+        self._last_render: Optional[Tuple[bool, Optional[int]]] = None
+
+        # Only two icon states exist, so load both once and swap references.
+        self._icons = {False: load_status_icon(False), True: load_status_icon(True)}
+        self._last_icon_state = False
+        self.icon = pystray.Icon("DumbWaiterTray", self._icons[False], TITLE_IDLE)
+        # Static menu: the handlers no-op when the worker is already in that state,
+        # so rendering the menu never has to poll the worker.
         self.icon.menu = pystray.Menu(
-            pystray.MenuItem(
-                "Turn on", self.turn_on, enabled=lambda _item: not self.is_running()
-            ),
-            pystray.MenuItem(
-                "Turn off", self.turn_off, enabled=lambda _item: self.is_running()
-            ),
+            pystray.MenuItem("Turn on", self.turn_on),
+            pystray.MenuItem("Turn off", self.turn_off),
             pystray.MenuItem("Reload config", self.reload_config),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem("Quit", self.quit_app),
         )
 
-        self._monitor_thread = threading.Thread(
-            target=self._monitor_worker, daemon=True
-        )
-        self._monitor_thread.start()
+        # The interpreter cannot change while the tray runs, so resolve it (and the
+        # worker command line) once. Failures are re-raised on the first start.
+        self._python_error: Optional[Exception] = None
+        try:
+            self._python_executable = self._resolve_python_executable(
+                self.requested_python_path
+            )
+        except Exception as exc:
+            self._python_error = exc
+            self._log_always(f"worker python resolution failed: {exc!r}")
+        else:
+            # Always log chosen Python path (aids frozen-mode debugging even without --debug)
+            self._log_always(f"worker python resolved to: {self._python_executable}")
+            self._cmd_template = [
+                self._python_executable,
+                "-u",
+                self._worker_script_str,
+                "--config",
+                self._config_path_str,
+            ]
+
+        # The worker environment and creation flags are fixed, so build them once.
+        env = os.environ.copy()
+        # Keep worker stdout/stderr UTF-8 when launched via pythonw/tray.
+        # Without this, UI labels like "RunAlt+⏎" can raise UnicodeEncodeError
+        # during logging and prevent the click path from completing.
+        env.setdefault("PYTHONUTF8", "1")
+        env.setdefault("PYTHONIOENCODING", "utf-8")
+        env.setdefault(
+            "PYTHONUNBUFFERED", "1"
+        )  # Force unbuffered I/O so logs appear immediately
+        self._worker_env = env
+        self._creation_flags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+        self._state_thread = threading.Thread(target=self._state_loop, daemon=True)
+        self._state_thread.start()
+
         atexit.register(self._atexit_cleanup)
         self._refresh_icon_and_title()
         self._log(
@@ -102,7 +186,7 @@ class DumbWaiterTrayApp:
         config_root = config_path.parent
         if (config_root / "dumb_waiter.py").exists():
             return config_root
-        return Path(__file__).resolve().parents[1]
+        return _REPO_ROOT_DEFAULT
 
     def _resolve_python_executable(self, requested_python: Optional[Path]) -> str:
         if requested_python is not None:
@@ -125,206 +209,302 @@ class DumbWaiterTrayApp:
             "Start tray with --python-path <path-to-python.exe>."
         )
 
-    def is_running(self) -> bool:
-        with self._lock:
-            return self._is_running_unlocked()
-
     def _is_running_unlocked(self) -> bool:
         return self._worker_process is not None and self._worker_process.poll() is None
 
-    def _refresh_icon_and_title(self) -> None:
-        running = self.is_running()
-        self.icon.icon = make_status_icon(running)
-        if running:
-            self.icon.title = "Dumb Waiter | ACTIVE"
-        elif self._last_exit_code is None:
-            self.icon.title = "Dumb Waiter | IDLE"
-        else:
-            self.icon.title = f"Dumb Waiter | IDLE | last exit={self._last_exit_code}"
-        try:
-            self.icon.update_menu()
-        except Exception:
-            pass
+    def _fast_is_running(self) -> bool:
+        """Lock-free, syscall-free best-effort check for UI refreshes.
+
+        _wait_worker sets returncode (via wait()) and clears _worker_process as soon
+        as the worker exits, so reading the attributes is enough for display.
+        """
+        proc = self._worker_process
+        return proc is not None and proc.returncode is None
 
-    def _log(self, message: str) -> None:
+    def _refresh_icon_and_title(self) -> None:
+        # Called from the wait and state threads; read and render under one lock
+        # so a stale state can't be written over a newer one and then cached.
+        with self._render_lock:
+            running = self._fast_is_running()
+            render_key = (running, self._last_exit_code)
+            if render_key == self._last_render:
+                # Nothing visible changed; skip the icon swap and title update.
+                return
+            if running != self._last_icon_state:
+                # Each assignment makes pystray rebuild the native icon handle.
+                self.icon.icon = self._icons[running]
+                self._last_icon_state = running
+            if running:
+                self.icon.title = TITLE_ACTIVE
+            elif self._last_exit_code is None:
+                self.icon.title = TITLE_IDLE
+            else:
+                self.icon.title = f"{TITLE_IDLE} | last exit={self._last_exit_code}"
+            self._last_render = render_key
+
+    def _log(self, message: str, stamp: Optional[str] = None) -> None:
         if not self.debug:
             return
-        self._log_always(message)
+        self._log_always(message, stamp)
 
-    def _log_always(self, message: str) -> None:
+    def _log_always(self, message: str, stamp: Optional[str] = None) -> None:
         """Write to tray.log unconditionally (used for critical diagnostics)."""
-        stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        if stamp is None:
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S")
         line = f"[{stamp}] {message}\n"
-        try:
-            with self.tray_log_path.open("a", encoding="utf-8") as f:
-                f.write(line)
-        except Exception:
-            pass
+        with self._tray_log_lock:
+            try:
+                if self._tray_log_fp is None:
+                    self._tray_log_fp = self.tray_log_path.open(
+                        "a", encoding="utf-8", buffering=1
+                    )
+                self._tray_log_fp.write(line)
+            except Exception:
+                pass
+
+    def _close_tray_log(self) -> None:
+        with self._tray_log_lock:
+            if self._tray_log_fp is not None:
+                try:
+                    self._tray_log_fp.close()
+                except Exception:
+                    pass
+                self._tray_log_fp = None
 
     def _start_worker(self) -> None:
+        # Only claim the "starting" slot under the lock; the stat/open/Popen work
+        # below runs unlocked so nothing queues behind CreateProcess.
         with self._lock:
-            if self._is_running_unlocked():
+            if self._is_running_unlocked() or self._starting:
                 self._log("start requested but worker already running")
                 return
+            self._starting = True
 
-            if not self.worker_script.exists():
-                raise FileNotFoundError(f"Worker script missing: {self.worker_script}")
-            if not self.config_path.exists():
+        log_handle = None
+        try:
+            if not self._worker_script_found:
+                if not os.path.exists(self._worker_script_str):
+                    raise FileNotFoundError(
+                        f"Worker script missing: {self.worker_script}"
+                    )
+                self._worker_script_found = True
+            if not os.path.exists(self._config_path_str):
                 raise FileNotFoundError(f"Config file missing: {self.config_path}")
-
-            self._worker_log_handle = self.log_path.open("a", encoding="utf-8")
-            self._worker_log_handle.write(
-                f"\n=== start {time.strftime('%Y-%m-%d %H:%M:%S')} ===\n"
-            )
-            self._worker_log_handle.flush()
-
-            python_executable = self._resolve_python_executable(
-                self.requested_python_path
-            )
-            # Always log chosen Python path (aids frozen-mode debugging even without --debug)
-            self._log_always(f"worker python resolved to: {python_executable}")
-            cmd = [
-                python_executable,
-                "-u",
-                str(self.worker_script),
-                "--config",
-                str(self.config_path),
-            ]
-            env = os.environ.copy()
-            # Keep worker stdout/stderr UTF-8 when launched via pythonw/tray.
-            # Without this, UI labels like "RunAlt+⏎" can raise UnicodeEncodeError
-            # during logging and prevent the click path from completing.
-            env.setdefault("PYTHONUTF8", "1")
-            env.setdefault("PYTHONIOENCODING", "utf-8")
-            env.setdefault(
-                "PYTHONUNBUFFERED", "1"
-            )  # Force unbuffered I/O so logs appear immediately
-            creation_flags = (
-                subprocess.CREATE_NO_WINDOW
-                if hasattr(subprocess, "CREATE_NO_WINDOW")
-                else 0
-            )
-            self._log(
-                f"starting worker python={python_executable} cmd={cmd} "
-                f"PYTHONUTF8={env.get('PYTHONUTF8')} "
-                f"PYTHONIOENCODING={env.get('PYTHONIOENCODING')}"
-            )
-
-            self._worker_process = subprocess.Popen(
+            if self._cmd_template is None:
+                raise self._python_error
+
+            # One timestamp for every line written about this transition.
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+            log_handle = self.log_path.open("a", encoding="utf-8")
+            log_handle.write(f"\n=== start {stamp} ===\n")
+            # The only flush: the marker must land before the child's own output.
+            log_handle.flush()
+
+            python_executable = self._python_executable
+            cmd = self._cmd_template
+            env = self._worker_env
+            if self.debug:
+                self._log(
+                    f"starting worker python={python_executable} cmd={cmd} "
+                    f"PYTHONUTF8={env.get('PYTHONUTF8')} "
+                    f"PYTHONIOENCODING={env.get('PYTHONIOENCODING')}",
+                    stamp=stamp,
+                )
+
+            proc = subprocess.Popen(
                 cmd,
-                cwd=str(self.repo_root),
-                stdout=self._worker_log_handle,
+                cwd=self._cwd_str,
+                stdout=log_handle,
                 stderr=subprocess.STDOUT,
-                creationflags=creation_flags,
+                creationflags=self._creation_flags,
                 env=env,
             )
+        except BaseException:
+            with self._lock:
+                self._starting = False
+            if log_handle is not None:
+                try:
+                    log_handle.close()
+                except Exception:
+                    pass
+            raise
+
+        with self._lock:
+            self._worker_process = proc
+            self._worker_log_handle = log_handle
             self._last_exit_code = None
-            self._log(f"worker started pid={self._worker_process.pid}")
+            self._starting = False
+        self._log(f"worker started pid={proc.pid}", stamp=stamp)
+        threading.Thread(target=self._wait_worker, args=(proc,), daemon=True).start()
 
         self._refresh_icon_and_title()
 
     def _stop_worker(self) -> None:
+        # Detach the process and its log handle together; whoever detaches them
+        # owns the cleanup, so the file I/O below needs no lock.
         with self._lock:
             proc = self._worker_process
+            log_handle = self._worker_log_handle
             self._worker_process = None
+            self._worker_log_handle = None
 
+        outcome = None
         if proc is not None:
             try:
                 proc.terminate()
                 proc.wait(timeout=5)
-                self._log(f"worker terminated gracefully pid={proc.pid}")
+                outcome = "terminated gracefully"
             except Exception:
                 try:
                     proc.kill()
-                    self._log(f"worker force-killed pid={proc.pid}")
+                    outcome = "force-killed"
                 except Exception:
                     pass
 
-        with self._lock:
-            if self._worker_log_handle is not None:
-                try:
-                    self._worker_log_handle.write(
-                        f"=== stop {time.strftime('%Y-%m-%d %H:%M:%S')} ===\n"
-                    )
-                    self._worker_log_handle.flush()
-                except Exception:
-                    pass
-                try:
-                    self._worker_log_handle.close()
-                except Exception:
-                    pass
-                self._worker_log_handle = None
+        if proc is not None or log_handle is not None:
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+            if outcome is not None:
+                self._log(f"worker {outcome} pid={proc.pid}", stamp=stamp)
+            if log_handle is not None:
+                self._close_worker_log(log_handle, f"=== stop {stamp} ===\n")
 
         self._refresh_icon_and_title()
 
-    def _monitor_worker(self) -> None:
-        while not self._stop_event.wait(1.0):
-            ended_code = None
+    @staticmethod
+    def _close_worker_log(log_handle, marker: str) -> None:
+        """Append the closing marker and close; close() does the only flush."""
+        try:
+            log_handle.write(marker)
+        except Exception:
+            pass
+        try:
+            log_handle.close()
+        except Exception:
+            pass
 
-            with self._lock:
-                if self._worker_process is not None:
-                    ended_code = self._worker_process.poll()
-                    if ended_code is not None:
-                        self._worker_process = None
-                        self._last_exit_code = ended_code
-                        if self._worker_log_handle is not None:
-                            try:
-                                self._worker_log_handle.write(
-                                    f"=== exited {time.strftime('%Y-%m-%d %H:%M:%S')} code={ended_code} ===\n"
-                                )
-                                self._worker_log_handle.flush()
-                            except Exception:
-                                pass
-                            try:
-                                self._worker_log_handle.close()
-                            except Exception:
-                                pass
-                            self._worker_log_handle = None
-
-            if ended_code is not None:
-                self._log(f"worker exited code={ended_code}")
-                self._refresh_icon_and_title()
+    def _wait_worker(self, proc: subprocess.Popen) -> None:
+        """Block until the worker exits, then record the exit once (no polling)."""
+        ended_code = proc.wait()
 
-    def turn_on(self, _icon=None, _item=None) -> None:
-        self._log("turn_on clicked")
+        with self._lock:
+            if self._worker_process is not proc:
+                # Stopped on purpose (or replaced); _stop_worker handled cleanup.
+                return
+            log_handle = self._worker_log_handle
+            self._worker_process = None
+            self._worker_log_handle = None
+            self._last_exit_code = ended_code
+
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        if log_handle is not None:
+            self._close_worker_log(
+                log_handle, f"=== exited {stamp} code={ended_code} ===\n"
+            )
+
+        # Let _state_loop decide whether the "on" intent still stands; it runs
+        # between transitions, so it can't race a reload that already restarted.
+        with self._state_cv:
+            self._worker_exited = True
+            self._state_cv.notify()
+        self._log(f"worker exited code={ended_code}", stamp=stamp)
+        self._refresh_icon_and_title()
+
+    def _state_loop(self) -> None:
+        """Apply the most recent turn on/off/reload intent, one at a time."""
+        while True:
+            with self._state_cv:
+                self._state_cv.wait_for(
+                    lambda: self._stop_event.is_set()
+                    or self._worker_exited
+                    or self._reload_requested
+                    or self._desired_running != self._applied_running
+                )
+                if self._stop_event.is_set():
+                    return
+                pending = (
+                    self._reload_requested
+                    or self._desired_running != self._applied_running
+                )
+                if self._worker_exited:
+                    self._worker_exited = False
+                    if not pending and not self._fast_is_running():
+                        # The worker died on its own; forget the "on" intent so
+                        # it isn't respawned and the next Turn on starts it.
+                        self._desired_running = False
+                        self._applied_running = False
+                if not pending:
+                    continue
+                want_running = self._desired_running
+                reload = self._reload_requested
+                self._applied_running = want_running
+                self._reload_requested = False
+
+            if reload:
+                self._stop_worker()
+                if self._apply_start("reload_config"):
+                    self._log("reload_config: worker restarted successfully")
+            elif want_running:
+                self._apply_start("turn_on")
+            else:
+                self._stop_worker()
+
+    def _apply_start(self, action: str) -> bool:
         try:
             self._start_worker()
+            return True
         except Exception as exc:
+            with self._state_cv:
+                self._desired_running = False
+                self._applied_running = False
             self._last_exit_code = -1
             self.icon.title = f"Dumb Waiter | ERROR | {exc}"
-            self._log(f"turn_on failed: {exc!r}")
-        self._refresh_icon_and_title()
+            self._log(f"{action} failed: {exc!r}")
+            return False
+        finally:
+            self._refresh_icon_and_title()
+
+    def _request_state(self, running: bool, reload: bool = False) -> None:
+        with self._state_cv:
+            self._desired_running = running
+            self._reload_requested = self._reload_requested or reload
+            self._state_cv.notify()
+
+    def turn_on(self, _icon=None, _item=None) -> None:
+        self._log("turn_on clicked")
+        self._request_state(True)
 
     def turn_off(self, _icon=None, _item=None) -> None:
         self._log("turn_off clicked")
-        self._stop_worker()
+        self._request_state(False)
 
     def reload_config(self, _icon=None, _item=None) -> None:
         """Stop the worker and restart it so it re-reads config.yaml."""
         self._log("reload_config clicked")
-        self._stop_worker()
-        try:
-            self._start_worker()
-            self._log("reload_config: worker restarted successfully")
-        except Exception as exc:
-            self._last_exit_code = -1
-            self.icon.title = f"Dumb Waiter | ERROR | {exc}"
-            self._log(f"reload_config failed: {exc!r}")
-        self._refresh_icon_and_title()
+        self._request_state(True, reload=True)
 
     def quit_app(self, _icon=None, _item=None) -> None:
         self._log("quit clicked")
-        self._stop_event.set()
-        self._stop_worker()
-        self._monitor_thread.join(timeout=2)
+        with self._state_cv:
+            self._stop_event.set()
+            self._state_cv.notify()
+        # Tear the worker down off the UI thread so the tray disappears at once.
+        # Non-daemon: the interpreter waits for it, so worker.log is closed cleanly.
+        threading.Thread(target=self._shutdown, daemon=False).start()
         self.icon.stop()
 
+    def _shutdown(self) -> None:
+        # Let an in-flight start/stop finish so it cannot leave a worker behind.
+        self._state_thread.join(timeout=6)
+        self._stop_worker()
+        self._close_tray_log()
+
     def _atexit_cleanup(self) -> None:
         """Safety net: stop worker if tray app exits unexpectedly."""
         try:
             self._stop_worker()
         except Exception:
             pass
+        self._close_tray_log()
 
     def run(self) -> None:
         self.icon.run()
@@ -333,7 +513,7 @@ class DumbWaiterTrayApp:
 def get_startup_error_log_path() -> Path:
     if getattr(sys, "frozen", False):
         return Path(sys.executable).resolve().parent / "startup_error.log"
-    return Path(__file__).resolve().parent / "startup_error.log"
+    return _MODULE_FILE.parent / "startup_error.log"
 
 
 def write_startup_error(exc: BaseException) -> None:
@@ -353,8 +533,7 @@ def write_startup_error(exc: BaseException) -> None:
 
 
 def main() -> None:
-    repo_root = Path(__file__).resolve().parents[1]
-    default_config = repo_root / "config.yaml"
+    default_config = _REPO_ROOT_DEFAULT / "config.yaml"
 
     parser = argparse.ArgumentParser(
         description="Dumb Waiter tray controller (Turn on / Turn off)."